@@ -1,4 +1,5 @@
 from cfw.framework.args.model import (
+    ArgKind,
     Argument,
     WildcardArgument,
     ListArgument,
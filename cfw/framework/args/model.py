@@ -1,10 +1,41 @@
+from enum import IntEnum
 from typing import Optional, Any
 
 from cfw.framework.errors import CommandArgumentError
 
 
+class ArgKind(IntEnum):
+    """
+    Tags for the concrete argument types. Hot dispatch paths compare these integers instead
+    of walking the class hierarchy with isinstance for every token.
+    """
+
+    NORMAL = 0
+    WILDCARD = 1
+    LIST = 2
+    FLAG = 3
+    POSITIONAL = 4
+    LIST_POSITIONAL = 5
+    WILDCARD_POSITIONAL = 6
+
+
 class ArgumentDefinition(object):
 
+    kind = ArgKind.NORMAL
+
+    __slots__ = (
+        "short_form",
+        "long_form",
+        "name",
+        "help",
+        "keyword",
+        "required",
+        "default",
+        "has_default",
+        "_forms_cache",
+        "_matchers",
+    )
+
     def __init__(
         self,
         short_form: Optional[str] = None,
@@ -21,9 +52,27 @@ class ArgumentDefinition(object):
         self.default: Optional[Any] = None
         self.has_default = False
 
+        # The matchable forms never change after construction so the formatted string
+        # is assembled once up front instead of on every forms() call
+        forms = ""
+        if short_form is not None:
+            forms += short_form
+
+        if long_form is not None:
+            if len(forms) > 0:
+                forms += ", "
+
+            forms += long_form
+
+        self._forms_cache = forms
+
+        # Tuple of the concrete forms this argument answers to - matching becomes a single
+        # membership test instead of a pair of branchy comparisons
+        self._matchers = tuple(f for f in (short_form, long_form) if f is not None)
+
     @property
     def positional(self) -> bool:
-        return False
+        return self.kind >= ArgKind.POSITIONAL
 
     def set_default(self, value: Any) -> None:
         self.default = value
@@ -38,25 +87,10 @@ class ArgumentDefinition(object):
         Returns a formatted string with the matchable forms for the argument
         :return:
         """
-        forms = ""
-        if self.short_form is not None:
-            forms += self.short_form
-
-        if self.long_form is not None:
-            if len(forms) > 0:
-                forms += ", "
-
-            forms += self.long_form
-
-        return forms
+        return self._forms_cache
 
     def matches(self, arg: str) -> bool:
-        matches = self.short_form is not None and arg == self.short_form
-
-        if matches is False:
-            matches = self.long_form is not None and arg == self.long_form
-
-        return matches
+        return arg in self._matchers
 
     def __str__(self) -> str:
         if self.name is not None:
@@ -65,14 +99,14 @@ class ArgumentDefinition(object):
 
 
 class Argument(ArgumentDefinition):
-    pass
+    __slots__ = ()
 
 
 class Positional(ArgumentDefinition):
 
-    @property
-    def positional(self) -> bool:
-        return True
+    __slots__ = ()
+
+    kind = ArgKind.POSITIONAL
 
     def check(self) -> None:
         if self.name is None:
@@ -83,20 +117,30 @@ class Positional(ArgumentDefinition):
 
 
 class ListPositional(Positional):
-    pass
+    __slots__ = ()
+
+    kind = ArgKind.LIST_POSITIONAL
 
 
 class WildcardPositional(Positional):
-    pass
+    __slots__ = ()
+
+    kind = ArgKind.WILDCARD_POSITIONAL
 
 
 class WildcardArgument(ArgumentDefinition):
-    pass
+    __slots__ = ()
+
+    kind = ArgKind.WILDCARD
 
 
 class ListArgument(ArgumentDefinition):
-    pass
+    __slots__ = ()
+
+    kind = ArgKind.LIST
 
 
 class Flag(ArgumentDefinition):
-    pass
+    __slots__ = ()
+
+    kind = ArgKind.FLAG
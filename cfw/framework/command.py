@@ -1,28 +1,43 @@
-import inspect
-import itertools
+import functools
 import sys
-from collections import defaultdict
-from typing import Optional, List, Any, Dict, Tuple, Callable, Iterator, TypeVar
+from collections import deque
+from typing import Optional, List, Any, Deque, Dict, Tuple, Callable, TypeVar
 
 from cfw.framework.args import *
 from cfw.framework.args.model import ArgumentDefinition
 from cfw.framework.errors import CommandError, CommandArgumentError
 from cfw.framework.formatting import format_two_column_output, format_one_column_output
-from cfw.framework.util import GREEDY_WHITESPACE_RE
 
 _EXEC_OK = "OK"
 _PRINT_HELP = "PRINT_HELP"
 
 _ARG_SWITCH_CHAR = "-"
 _PRIVATE_NAME_PREFIX = "__"
-_HELP_ARGUMENTS = ("-h", "-?", "--help")
-_LAST_DEFAULT_ITR_VALUE = "LAST_DEFAULT_ITER"
+_HELP_ARGUMENTS = frozenset(("-h", "-?", "--help"))
 
 UserFuncType = TypeVar("UserFuncType", bound=Callable[..., Any])
 
 
 class CommandWrapper(object):
 
+    __slots__ = (
+        "func",
+        "path",
+        "path_spec",
+        "path_str",
+        "argdefs",
+        "name",
+        "help",
+        "_func_args",
+        "_func_defaults",
+        "_processed",
+        "_matcher_map",
+        "_required_argdefs",
+        "_kwargs_template",
+        "_positionals",
+        "_non_positionals",
+    )
+
     def __init__(
         self,
         func: UserFuncType,
@@ -32,17 +47,27 @@ class CommandWrapper(object):
         arguments: Optional[List[ArgumentDefinition]] = None,
     ) -> None:
         self.func = func
-        self.path: List[str] = list()
+        self.path: List[str] = []
         self.path_spec = path
-        self.argdefs: List[ArgumentDefinition] = list()
-        self._func_argspec = inspect.getfullargspec(self.func)
+        self.argdefs: List[ArgumentDefinition] = []
+
+        # Function introspection is deferred until the command is actually dispatched or asked
+        # for argument help - many commands in a scanned tree are never touched in a given run
+        self._func_args: Tuple[str, ...] = ()
+        self._func_defaults: Tuple[Any, ...] = ()
+        self._processed = False
 
         # If there's no name specified then use the name of the fuction instead
         self.name: str = name if name is not None else self.func.__name__
 
         if self.path_spec is not None:
-            # If there's a path_spec, parse it into our path array
-            self.path.extend(GREEDY_WHITESPACE_RE.split(self.path_spec))
+            # If there's a path_spec, parse it into our path array - bare str.split already
+            # collapses whitespace runs without invoking the regex engine
+            self.path.extend(self.path_spec.split())
+
+        # The joined form of the path is needed whenever help output renders the command's
+        # usage line, so build it once here
+        self.path_str = " ".join(self.path)
 
         self.help: str = "" if help is None else help
 
@@ -54,48 +79,53 @@ class CommandWrapper(object):
         if arguments is not None:
             self.argdefs.extend(arguments)
 
-        # Process our definitions and do some sanity checks
-        self._process_arg_defs()
+        # The help-signature hygiene check needs no introspection, so it stays eager - a bad
+        # definition should fail at decoration time, not when the command is first invoked
+        for arg_def in self.argdefs:
+            if arg_def.short_form in _HELP_ARGUMENTS or arg_def.long_form in _HELP_ARGUMENTS:
+                raise CommandArgumentError(
+                    f"Arguments may not carry the signature of: {', '.join(sorted(_HELP_ARGUMENTS))}"
+                )
 
-    def _positional_argdefs(self) -> List[Positional]:
-        return [a for a in self.argdefs if isinstance(a, Positional)]
+    def _ensure_processed(self) -> None:
+        if self._processed is True:
+            return
 
-    def _non_positional_argdefs(self) -> List[ArgumentDefinition]:
-        return [a for a in self.argdefs if not a.positional]
+        # Read the positional keyword names and defaults straight off the code object - this
+        # is everything getfullargspec was being used for, minus the inspect machinery
+        code = self.func.__code__
+        self._func_args = code.co_varnames[: code.co_argcount]
+        self._func_defaults = self.func.__defaults__ if self.func.__defaults__ is not None else ()
+
+        # Process our definitions and do some sanity checks
+        self._process_arg_defs()
+        self._processed = True
 
     def _process_arg_defs(self) -> None:
-        # Iterator to track our position in the arg keyword list in reverse
-        arg_kw_iter: Iterator[str] = reversed(self._func_argspec.args)
-
-        # We create the arg_defaults iterator with an empty list first to avoid any weird
-        # special-case checks while popping off default values
-        arg_default_iter: Iterator[Any] = iter(list())
-        if self._func_argspec.defaults is not None:
-            # If there is a set of defaults in the argspec, iterate through them in reverse
-            arg_default_iter = reversed(self._func_argspec.defaults)
-
-        for arg_def in reversed(self.argdefs):
-            # Check the annotation for hygiene first
-            if arg_def.short_form in _HELP_ARGUMENTS or arg_def.long_form in _HELP_ARGUMENTS:
-                raise CommandArgumentError("Arguments may not carry the signature of: {}".format(_HELP_ARGUMENTS))
+        func_args = self._func_args
+        func_defaults = self._func_defaults
 
-            # Assign the matching function keyword
-            try:
-                arg_def.keyword = next(arg_kw_iter)
-            except StopIteration:
+        num_args = len(func_args)
+        num_defaults = len(func_defaults)
+        num_defs = len(self.argdefs)
+
+        for idx, arg_def in enumerate(self.argdefs):
+            # Argument definitions pair up with the tail of the function's keyword list
+            kw_idx = num_args - num_defs + idx
+            if kw_idx < 0:
                 raise CommandArgumentError(
-                    "CLI argument {} defined but function {} has no answering argument.".format(
-                        arg_def, self.func.__name__
-                    )
-                ) from None
+                    f"CLI argument {arg_def} defined but function {self.func.__name__} has no answering argument."
+                )
+
+            arg_def.keyword = func_args[kw_idx]
 
-            # Map the default if any
-            next_default = next(arg_default_iter, _LAST_DEFAULT_ITR_VALUE)
-            if next_default is not _LAST_DEFAULT_ITR_VALUE:
-                arg_def.set_default(next_default)
+            # Defaults, in turn, pair up with the tail of the keyword list
+            default_idx = idx - (num_defs - num_defaults)
+            if default_idx >= 0:
+                arg_def.set_default(func_defaults[default_idx])
 
             # If there's no default but the argument is a flag, default to False
-            if arg_def.has_default is False and isinstance(arg_def, Flag):
+            if arg_def.has_default is False and arg_def.kind is ArgKind.FLAG:
                 arg_def.set_default(False)
 
         # Run sanity checks now that the argument definitions have been filled out with the remainder of
@@ -103,59 +133,85 @@ class CommandWrapper(object):
         for arg_def in self.argdefs:
             arg_def.check()
 
+        # Index the matchable forms of every non-positional argument so that dispatch can find the
+        # right definition with a single dict probe instead of scanning every definition per token
+        self._matcher_map: Dict[str, ArgumentDefinition] = {}
+        for arg_def in self.argdefs:
+            if arg_def.positional:
+                continue
+
+            if arg_def.short_form is not None:
+                self._matcher_map[arg_def.short_form] = arg_def
+
+            if arg_def.long_form is not None:
+                self._matcher_map[arg_def.long_form] = arg_def
+
+        # Partition the definitions once - dispatch and help previously re-split them on
+        # every invocation even though the split never changes after processing
+        self._positionals = [a for a in self.argdefs if a.positional]
+        self._non_positionals = [a for a in self.argdefs if not a.positional]
+
+        # Arguments without a default must be supplied by the user - snapshot them once here so
+        # the final validation in __call__ doesn't rescan every definition per invocation
+        self._required_argdefs = tuple(a for a in self.argdefs if a.has_default is False)
+
+        # Default values are likewise static once processing completes, so the kwargs seed for
+        # each dispatch becomes a dict copy instead of a loop over every definition
+        self._kwargs_template = {a.keyword: a.default for a in self.argdefs if a.default is not None}
+
     def print_help(self) -> None:
+        self._ensure_processed()
+
         # If there aren't any args, tell the user
         if len(self.argdefs) == 0:
             print("This command has no arguments specified.")
             return
 
-        # Try to print out detailed argument help
-        non_positional_argdefs = self._non_positional_argdefs()
-        positional_argdefs = self._positional_argdefs()
-
-        if len(non_positional_argdefs) > 0:
-            # Do non-positional args first
-            for argdef in self.argdefs:
-                if not argdef.positional:
-                    print(format_two_column_output(str(argdef), argdef.help))
+        # Try to print out detailed argument help using the cached partitions - do the
+        # non-positional args first
+        if len(self._non_positionals) > 0:
+            for argdef in self._non_positionals:
+                print(format_two_column_output(str(argdef), argdef.help))
 
-            if len(positional_argdefs) > 0:
+            if len(self._positionals) > 0:
                 # Add an additional newline if there are positional arguments
                 print("")
 
         # Follow up with positional arguments last
-        for argdef in positional_argdefs:
-            if argdef.positional:
-                print(format_two_column_output(str(argdef), argdef.help))
+        for argdef in self._positionals:
+            print(format_two_column_output(str(argdef), argdef.help))
 
     @property
     def depth(self) -> int:
         return len(self.path)
 
     def __call__(self, argv: List[Any]) -> Any:
-        # Scan argdefs for potential help requests
-        for arg in argv:
-            if arg in _HELP_ARGUMENTS:
-                return _PRINT_HELP
+        self._ensure_processed()
+
+        # A help token anywhere in argv trumps mapping the rest of it, even where a value
+        # was expected - isdisjoint scans the whole vector in one C-level pass
+        if not _HELP_ARGUMENTS.isdisjoint(argv):
+            return _PRINT_HELP
 
         # Generate a kwargs dict
         try:
-            kwargs = ArgumentMapper(self._positional_argdefs(), self._non_positional_argdefs()).map_to_kwargs(argv)
+            # The positional argdefs are copied into a deque since the mapper consumes
+            # them from the front while parsing
+            kwargs = ArgumentMapper(
+                deque(self._positionals), self._non_positionals, self._matcher_map, self._kwargs_template
+            ).map_to_kwargs(argv)
         except CommandError as ce:
             # Command errors here should be output directly to the user without a stacktrace
-            print("{}\n".format(ce.msg))
+            print(f"{ce.msg}\n")
             return _PRINT_HELP
 
         # Last but not least, we test to make sure all required arguments are provided
-        required_arguments = list()
-        for arg_def in self.argdefs:
-            if arg_def.has_default is False and kwargs.get(arg_def.keyword) is None:
-                required_arguments.append(arg_def)
+        missing_arguments = [a for a in self._required_argdefs if kwargs.get(a.keyword) is None]
 
         # If we're missing required arguments, remind the user of what we need and then print the help output
-        if len(required_arguments) > 0:
-            for arg_def in required_arguments:
-                print("Argument required but not set: {}".format(arg_def))
+        if len(missing_arguments) > 0:
+            for arg_def in missing_arguments:
+                print(f"Argument required but not set: {arg_def}")
 
             print("")
             return _PRINT_HELP
@@ -172,42 +228,47 @@ class CommandWrapper(object):
 
 class CommandNode(object):
 
+    __slots__ = ("cmd", "is_root", "descendants", "name", "help", "_subcmd_help_cache")
+
     def __init__(self, cmd: CommandWrapper, is_root: bool = False) -> None:
         self.cmd = cmd
         self.is_root = is_root
-        self.descendants: Dict[str, CommandNode] = dict()
+        self.descendants: Dict[str, CommandNode] = {}
+
+        # Commands never change their name or help after registration, so copy both onto the
+        # node as plain attributes instead of going through the descriptor protocol per access
+        self.name = cmd.name
+        self.help = cmd.help
+
+        # Rendered subcommand help, built on first use and discarded when a descendant changes
+        self._subcmd_help_cache: Optional[str] = None
 
     def append(self, cmd: "CommandNode") -> None:
-        self.descendants[cmd.name] = cmd
+        # Interned names let the descendant dict short-circuit key comparison to a pointer
+        # check when the same subcommand word is probed during dispatch
+        self.descendants[sys.intern(cmd.name)] = cmd
+        self._subcmd_help_cache = None
 
     def get(self, name: str) -> Optional["CommandNode"]:
         return self.descendants.get(name)
 
     def print_help(self, cli_call_name: str) -> None:
-        cmd_path = "{} {}".format(" ".join(self.cmd.path), self.name) if self.cmd.depth > 0 else self.name
-        cmd_spec = "Usage: {} {}".format(cli_call_name, cmd_path)
+        cmd_path = f"{self.cmd.path_str} {self.name}" if self.cmd.depth > 0 else self.name
+        cmd_spec = f"Usage: {cli_call_name} {cmd_path}"
 
         # Building an arg spec string is important for things like positional arguments where the order
         # of the argument determines where it is slotted in the target function
-        cmd_arg_spec = "[options]"
-        for argdef in self.cmd.argdefs:
-            if argdef.positional is True:
-                # If this isn't the first positional arg added to the cmd_arg_spec then we need as space
-                if len(cmd_arg_spec) > 0:
-                    cmd_arg_spec += " "
+        cmd_arg_spec_parts = ["[options]"]
+        cmd_arg_spec_parts.extend(f"<{argdef.name}>" for argdef in self.cmd.argdefs if argdef.positional)
 
-                cmd_arg_spec += "<{}>".format(argdef.name)
-
-        # If there were positional arguments we need to append the cmd_arg_spec to the cmd_spec for output
-        if len(cmd_arg_spec) > 0:
-            cmd_spec += " {}".format(cmd_arg_spec)
+        cmd_spec += f" {' '.join(cmd_arg_spec_parts)}"
 
         # Usage line first with the name we were called by on the CLI
-        print("{}\n".format(cmd_spec))
+        print(f"{cmd_spec}\n")
 
         # Only output the help info if we have a help specified that is of non-zero length
         if self.help is not None and len(self.help) > 0:
-            print("{}\n".format(format_one_column_output(self.help)))
+            print(f"{format_one_column_output(self.help)}\n")
 
         # List subcommands if any
         if len(self.descendants) > 0:
@@ -220,20 +281,16 @@ class CommandNode(object):
         self.cmd.print_help()
 
     def _print_subcmd_help(self) -> None:
-        output = "Available Commands:\n"
+        if self._subcmd_help_cache is None:
+            lines = ["Available Commands:"]
+            lines.extend(format_two_column_output(name, subcmd.help) for name, subcmd in self.descendants.items())
 
-        for name, subcmd in self.descendants.items():
-            output += "{}\n".format(format_two_column_output(name, subcmd.help))
+            # The rendered block always carries a trailing newline
+            lines.append("")
 
-        print(output)
+            self._subcmd_help_cache = "\n".join(lines)
 
-    @property
-    def help(self) -> str:
-        return self.cmd.help
-
-    @property
-    def name(self) -> str:
-        return self.cmd.name
+        print(self._subcmd_help_cache)
 
     def exec(self, cli_call_name: str, argv: List[Any]) -> None:
         result = self.cmd(argv)
@@ -242,7 +299,7 @@ class CommandNode(object):
             self.print_help(cli_call_name)
 
     def __str__(self) -> str:
-        return "CommandNode({})".format(self.name)
+        return f"CommandNode({self.name})"
 
 
 class CommandTrie(object):
@@ -269,31 +326,38 @@ class CommandTrie(object):
             argv = sys.argv
 
         # No argdefs usually means the user is hunting for the help output, otherwise
-        # if the first argument is a help argument, print help as well.
-        if len(argv) <= 1 or argv[1] in _HELP_ARGUMENTS:
+        # if the first argument is a help argument, print help as well. The one-character
+        # switch check gates the set probe since argv[1] is usually a subcommand word.
+        if len(argv) <= 1 or (argv[1][:1] == _ARG_SWITCH_CHAR and argv[1] in _HELP_ARGUMENTS):
             self.print_help()
             return False
 
-        # List for capturing anything that looks like a CLI argument and not part of the command path
-        args_list = list()
+        # Fast-reject unknown top-level commands with a single probe - command paths always
+        # begin with a direct descendant of the root
+        if argv[1] not in self._root_cmd.descendants:
+            print(f"Unknown command: {' '.join(argv)}\n")
+
+            self.print_help()
+            return False
 
-        # Always start at argv[1] for the command path
+        # Walk the command path starting at argv[1] - command paths are always a contiguous
+        # prefix of argv, so the first token that fails to match marks the start of the
+        # command's arguments and ends the walk
         cursor = self._root_cmd
-        for arg in argv[1:]:
-            # Attempt to match the argument against our path - anything that doesn't match
-            # gets added to the argument list
-            potential_next = cursor.get(arg)
-            if potential_next is not None:
-                cursor = potential_next
-            else:
-                args_list.append(arg)
+        cursor_descendants = cursor.descendants
+        idx = 1
+        argv_len = len(argv)
+        while idx < argv_len:
+            potential_next = cursor_descendants.get(argv[idx])
+            if potential_next is None:
+                break
 
-        # If the cursor is still pointing at our root dictionary then no command parts matched
-        if cursor is self._root_cmd:
-            print("Unknown command: {}\n".format(" ".join(argv)))
+            cursor = potential_next
+            cursor_descendants = potential_next.descendants
+            idx += 1
 
-            self.print_help()
-            return False
+        # Everything after the matched path is an argument for the command
+        args_list = argv[idx:]
 
         cursor.exec(self.cli_call_name, args_list)
         return True
@@ -330,87 +394,130 @@ class CommandTrie(object):
             self._root_cmd.append(CommandNode(command))
 
         else:
-            target, last_path = self.find(command.path)
-            while target is None:
-                # Get the name of the command we choked on
-                missing_cmd = last_path[len(last_path) - 1]
-
-                # Recreate the path string for insertion
-                path_str = None
-                if len(last_path) > 1:
-                    path_str = " ".join(last_path[: len(last_path) - 1])
+            # Walk the command's path once from the root, creating stubs in place for any
+            # missing ancestors - a stub may be overwritten by further, more specific inserts
+            cursor = self._root_cmd
+            for idx, path_part in enumerate(command.path):
+                potential_next = cursor.get(path_part)
+                if potential_next is None:
+                    path_str = " ".join(command.path[:idx]) if idx > 0 else None
+                    potential_next = CommandNode(command_stub(path_part, path=path_str))
+                    cursor.append(potential_next)
 
-                # Create a command stub - this may be overwritten by further, more specific inserts
-                self.insert(command_stub(missing_cmd, path=path_str))
-
-                # Attempt to resolve our path again
-                target, last_path = self.find(command.path)
+                cursor = potential_next
 
-            target.append(CommandNode(command))
+            cursor.append(CommandNode(command))
 
         return True
 
 
-class ArgumentIterator(object):
-
-    def __init__(self, argv: List[Any]) -> None:
-        self._idx = 0
-        self._argv = argv
-
-    def finish(self) -> None:
-        self._idx = len(self._argv)
-
-    def advance(self, steps: int = 1) -> None:
-        self._idx += steps
-
-    def get(self) -> Any:
-        return self._argv[self._idx]
-
-    def get_rest(self) -> List[Any]:
-        return self._argv[self._idx :]
-
-    @property
-    def on_last(self) -> bool:
-        return self._idx + 1 == len(self._argv)
-
-    @property
-    def empty(self) -> bool:
-        return self._idx >= len(self._argv)
-
-
 class ArgumentMapper(object):
 
-    def __init__(self, positionals: List[Positional], non_positionals: List[ArgumentDefinition]) -> None:
+    __slots__ = ("positionals", "non_positionals", "matcher_map", "kwargs_template")
+
+    def __init__(
+        self,
+        positionals: Deque[Positional],
+        non_positionals: List[ArgumentDefinition],
+        matcher_map: Dict[str, ArgumentDefinition],
+        kwargs_template: Dict[str, Any],
+    ) -> None:
         # Track different argument types to make searching more deterministic
         self.positionals = positionals
         self.non_positionals = non_positionals
+        self.matcher_map = matcher_map
+        self.kwargs_template = kwargs_template
 
     def _match_arg(self, arg: str) -> Optional[ArgumentDefinition]:
-        # Search non-positional argument definitions first
-        for argdef in self.non_positionals:
-            if argdef.matches(arg):
-                return argdef
-        return None
+        # Non-positional argument definitions are indexed by their matchable forms
+        return self.matcher_map.get(arg)
+
+    def _gather_flag(self, argdef: ArgumentDefinition, argv: List[Any], idx: int, kwargs: Dict[str, Any]) -> int:
+        kwargs[argdef.keyword] = True
+        return idx + 1
+
+    def _gather_list(self, argdef: ArgumentDefinition, argv: List[Any], idx: int, kwargs: Dict[str, Any]) -> int:
+        kwargs.setdefault(argdef.keyword, []).append(argv[idx + 1])
+        return idx + 2
+
+    def _gather_wildcard(self, argdef: ArgumentDefinition, argv: List[Any], idx: int, kwargs: Dict[str, Any]) -> int:
+        kwargs.setdefault(argdef.keyword, []).extend(argv[idx + 1 :])
+        return len(argv)
+
+    def _gather_argument(self, argdef: ArgumentDefinition, argv: List[Any], idx: int, kwargs: Dict[str, Any]) -> int:
+        kwargs[argdef.keyword] = argv[idx + 1]
+        return idx + 2
+
+    def _gather_list_positional(
+        self, argdef: ArgumentDefinition, argv: List[Any], idx: int, kwargs: Dict[str, Any]
+    ) -> int:
+        # First remove this positional argdef from our queue of positional arg defs
+        self.positionals.popleft()
+
+        # Add the arg as our value
+        kwargs.setdefault(argdef.keyword, []).append(argv[idx])
+        idx += 1
+
+        # Continue consuming arguments until the next match or until we reach a point
+        # where other positional arguments expect to be filled in
+        argv_len = len(argv)
+        while idx + 1 < argv_len:
+            # If an argument definition matches then we're done with this list
+            if self._match_arg(argv[idx]) is not None:
+                break
+
+            idx += 1
+
+        return idx
+
+    def _gather_wildcard_positional(
+        self, argdef: ArgumentDefinition, argv: List[Any], idx: int, kwargs: Dict[str, Any]
+    ) -> int:
+        # First remove this positional argdef from our queue of positional arg defs
+        self.positionals.popleft()
+
+        kwargs.setdefault(argdef.keyword, []).extend(argv[idx:])
+        return len(argv)
+
+    def _gather_positional(
+        self, argdef: ArgumentDefinition, argv: List[Any], idx: int, kwargs: Dict[str, Any]
+    ) -> int:
+        # First remove this positional argdef from our queue of positional arg defs
+        self.positionals.popleft()
+
+        kwargs[argdef.keyword] = argv[idx]
+        return idx + 1
+
+    # Gather handlers keyed by kind tag - one dict lookup per token replaces the elif
+    # ladder that compared every kind in turn. The table is built once at class-creation
+    # time; since a mapper is constructed per dispatch, a per-instance table of bound
+    # methods would cost more than the ladder it replaced
+    _GATHER_HANDLERS = {
+        ArgKind.FLAG: _gather_flag,
+        ArgKind.LIST: _gather_list,
+        ArgKind.WILDCARD: _gather_wildcard,
+        ArgKind.NORMAL: _gather_argument,
+        ArgKind.LIST_POSITIONAL: _gather_list_positional,
+        ArgKind.WILDCARD_POSITIONAL: _gather_wildcard_positional,
+        ArgKind.POSITIONAL: _gather_positional,
+    }
 
     def _prepare_kwargs(self) -> Dict[str, Any]:
-        kwargs: Dict[str, Any] = defaultdict(list)
-
-        # Map all flags first as False
-        arg_def_iter: Iterator[ArgumentDefinition] = itertools.chain(self.positionals, self.non_positionals)
-        for arg_def in arg_def_iter:
-            if arg_def.default is not None:
-                # Function argument defaults beat out our typing
-                kwargs[arg_def.keyword] = arg_def.default
-
-        return kwargs
+        # Defaults were gathered once at argument-processing time - seeding the kwargs is a
+        # single dict copy, and only the list-style gather handlers create lists on demand
+        return dict(self.kwargs_template)
 
     def map_to_kwargs(self, argv: List[Any]) -> Dict[str, Any]:
-        arg_source = ArgumentIterator(argv)
         kwargs = self._prepare_kwargs()
 
-        while arg_source.empty is False:
+        # Parse state lives in two plain locals - the cursor index and the argv length -
+        # instead of an iterator object with per-step method calls
+        idx = 0
+        argv_len = len(argv)
+
+        while idx < argv_len:
             # Get the next argument
-            arg = arg_source.get()
+            arg = argv[idx]
 
             # Try to match the arg against non-positional argdefs first
             argdef = self._match_arg(arg)
@@ -418,66 +525,22 @@ class ArgumentMapper(object):
             if argdef is None:
                 # If there are no positional arguments remaining then this argument is unknown
                 if len(self.positionals) == 0 or arg.startswith(_ARG_SWITCH_CHAR):
-                    raise CommandError("Unknown argument: {}".format(arg))
+                    raise CommandError(f"Unknown argument: {arg}")
 
                 # Select the first positional argument
                 argdef = self.positionals[0]
 
-            # Attempt to gather up the value that's represented by the argument
-            if isinstance(argdef, Flag):
-                kwargs[argdef.keyword] = True
-                arg_source.advance()
-
-            elif isinstance(argdef, ListArgument):
-                arg_source.advance()
-                kwargs[argdef.keyword].append(arg_source.get())
-                arg_source.advance()
-
-            elif isinstance(argdef, WildcardArgument):
-                arg_source.advance()
-                kwargs[argdef.keyword].extend(arg_source.get_rest())
-                arg_source.finish()
-
-            elif isinstance(argdef, Argument):
-                arg_source.advance()
-                kwargs[argdef.keyword] = arg_source.get()
-                arg_source.advance()
-
-            elif isinstance(argdef, ListPositional):
-                # First remove this positional argdef from our list of positional arg defs
-                self.positionals.pop(0)
-
-                # Add the arg as our value
-                kwargs[argdef.keyword].append(arg_source.get())
-                arg_source.advance()
-
-                # Continue consuming arguments until the next match or until we reach a point
-                # where other positional arguments expect to be filled in
-                while not arg_source.on_last and not arg_source.empty:
-                    # If an argument definition matches then we're done with this list
-                    if self._match_arg(arg_source.get()) is not None:
-                        break
-
-                    arg_source.advance()
-
-            elif isinstance(argdef, WildcardPositional):
-                # First remove this positional argdef from our list of positional arg defs
-                self.positionals.pop(0)
-
-                kwargs[argdef.keyword].extend(arg_source.get_rest())
-                arg_source.finish()
-
-            elif isinstance(argdef, Positional):
-                # First remove this positional argdef from our list of positional arg defs
-                self.positionals.pop(0)
-
-                kwargs[argdef.keyword] = arg_source.get()
-                arg_source.advance()
+            # Gather up the value that's represented by the argument - each handler returns
+            # the index of the next unconsumed token. The table holds plain functions, so
+            # self is passed explicitly
+            idx = self._GATHER_HANDLERS[argdef.kind](self, argdef, argv, idx, kwargs)
 
         return kwargs
 
-
+@functools.lru_cache(maxsize=None)
 def command_stub(name: str, path: Optional[str] = None, help: Optional[str] = "") -> CommandWrapper:
+    # Stubs are immutable once built, so identical (name, path, help) requests share one
+    # wrapper instead of constructing a fresh closure and CommandWrapper each time
 
     def _stub_closure() -> str:
         return _PRINT_HELP
@@ -1,34 +1,37 @@
 import importlib
+import importlib.util
 import os
 import sys
 import traceback
-from typing import Callable, List, Any, Optional, TypeVar
+from collections import deque
+from typing import Callable, Dict, List, Any, Optional, TypeVar
 
 from cfw.framework.args.model import ArgumentDefinition
 from cfw.framework.command import CommandWrapper, CommandTrie, UserFuncType
 from cfw.framework.errors import CommandDependencyError, CommandError
 
 _PYTHON_SRC_CODE_EXT = ".py"
-_PYTHON_BYTE_CODE_EXT = ".pyc"
 _PRIVATE_NAME_PREFIX = "__"
-_IGNORE_LIST = ("__pycache__", "__init__.py")
-_PYTHON_EXTENSIONS = (_PYTHON_SRC_CODE_EXT, _PYTHON_BYTE_CODE_EXT)
 _PYTHON_MODULE_INIT_FILE = "__init__.py"
 
 WrappedFuncType = TypeVar("WrappedFuncType", bound=Callable[[UserFuncType], CommandWrapper])
 
-
-def _is_python_src_file(filename: str) -> bool:
-    return filename.endswith(_PYTHON_SRC_CODE_EXT)
+# Wrappers indexed by the module that defines them, populated as @command decorators run at
+# import time. Scanning a module is then a single registry lookup instead of a dir() sweep
+# over every attribute it exposes
+_COMMAND_REGISTRY: Dict[str, List[CommandWrapper]] = {}
 
 
 def _is_relative(module: str) -> bool:
     return module.startswith(".")
 
 
-def _file_extension(path: str) -> str:
-    ext_parts = os.path.splitext(path)
-    return ext_parts[1] if len(ext_parts) > 1 else ""
+def _import(module_name: str) -> Any:
+    # Modules already imported - including those pulled in transitively by earlier imports
+    # in the same scan - are served straight from sys.modules without the importlib
+    # machinery spinning up
+    cached = sys.modules.get(module_name)
+    return cached if cached is not None else importlib.import_module(module_name)
 
 
 def command(
@@ -45,7 +48,9 @@ def command(
     """
 
     def _factory(target_func: UserFuncType) -> CommandWrapper:
-        return CommandWrapper(target_func, name, path, help, arguments)
+        wrapper = CommandWrapper(target_func, name, path, help, arguments)
+        _COMMAND_REGISTRY.setdefault(target_func.__module__, []).append(wrapper)
+        return wrapper
 
     return _factory
 
@@ -63,8 +68,8 @@ def dispatch(
             "Attempting an import of a relative module requires the package argument to be specified."
         )
 
-    if argv is None:
-        argv = sys.argv
+    # None already acts as the "use the process argv" sentinel; bind the real list once
+    argv = sys.argv if argv is None else argv
 
     trie = scan(argv[0], module, package, verbose, help)
 
@@ -88,11 +93,23 @@ def scan(
     This crawls all of the modules below us and imports them recursively
     :return:
     """
-    root_module = importlib.import_module(module, package=package)
+    def _log(message: str, *args: Any) -> None:
+        # Verbose output funnels through here so the format work only happens when the
+        # flag is actually set
+        if verbose:
+            print(message.format(*args))
+
+    # Resolve the root name up front so a module that is already imported - the common
+    # case when dispatch() runs from inside the package being scanned - comes straight out
+    # of sys.modules
+    root_module_name = importlib.util.resolve_name(module, package) if _is_relative(module) else module
+    root_module = sys.modules.get(root_module_name)
+    if root_module is None:
+        root_module = importlib.import_module(module, package=package)
+
     root_path = root_module.__file__
 
-    if verbose:
-        print("Scanning module {} starting at file path: {}".format(module, root_path))
+    _log("Scanning module {} starting at file path: {}", module, root_path)
 
     # Format the module name correctly if this is a relative import we're starting with
     target_module = module
@@ -108,71 +125,80 @@ def scan(
         search_path = os.path.dirname(root_path)
 
     # First identify all submodules
-    submodule_names = list()
+    submodule_names = []
 
     # If our search path is not a directory, move on
     if os.path.isdir(search_path):
-        for filename in os.listdir(search_path):
-            if filename in _IGNORE_LIST:
-                continue
-
-            abs_path = os.path.join(search_path, filename)
-            init_path = os.path.join(abs_path, _PYTHON_MODULE_INIT_FILE)
-
-            module_name = ""
-            if os.path.isdir(abs_path) and os.path.exists(init_path):
-                # Figure out if we're dealing with a directory that has the init file
-                module_name = ".".join((target_module, filename))
-            elif _is_python_src_file(filename):
-                # Is it a python source file that's stand-alone?
-                file_module_name = os.path.splitext(filename)[0]
-                module_name = ".".join((target_module, file_module_name))
-            else:
-                # I don't like this continue but avoiding the print statement twice is a nice consequence
-                continue
-
-            if verbose:
-                print("Adding module {} to the scan list.".format(module_name))
-
-            # Add the module to our scan and import list
-            submodule_names.append(module_name)
-
-    # Load the modules
-    submodules = [importlib.import_module(n) for n in submodule_names]
+        # Walk the package tree with a worklist of (directory, dotted prefix) pairs so
+        # nested packages are picked up too. scandir hands back entries with their type
+        # cached from the directory read, cutting the per-entry stat calls that
+        # listdir+isdir/exists cost
+        # Local bindings skip the repeated os.path attribute lookups inside the walk
+        path_join = os.path.join
+        path_isfile = os.path.isfile
+
+        pending_dirs = deque(((search_path, target_module),))
+        while pending_dirs:
+            dir_path, module_prefix = pending_dirs.popleft()
+
+            with os.scandir(dir_path) as dir_entries:
+                for entry in dir_entries:
+                    filename = entry.name
+
+                    # No explicit ignore list needed: __pycache__ fails the package probe
+                    # below since it has no init file, and the init file itself is excluded
+                    # from the source-file branch by name
+                    module_name = ""
+                    if entry.is_dir() and path_isfile(path_join(entry.path, _PYTHON_MODULE_INIT_FILE)):
+                        # A directory with the init file is a package - queue it so its own
+                        # submodules are scanned as well
+                        module_name = ".".join((module_prefix, filename))
+                        pending_dirs.append((entry.path, module_name))
+                    elif (
+                        entry.is_file()
+                        and filename.endswith(_PYTHON_SRC_CODE_EXT)
+                        and filename != _PYTHON_MODULE_INIT_FILE
+                    ):
+                        # Is it a python source file that's stand-alone? Slicing the extension
+                        # off directly beats a full splitext parse for a known suffix
+                        file_module_name = filename[: -len(_PYTHON_SRC_CODE_EXT)]
+                        module_name = ".".join((module_prefix, file_module_name))
+                    else:
+                        # I don't like this continue but avoiding the print statement twice is a nice consequence
+                        continue
+
+                    _log("Adding module {} to the scan list.", module_name)
+
+                    # Add the module to our scan and import list
+                    submodule_names.append(module_name)
+
+    # Load the modules - names are deduplicated before importing so nothing is resolved
+    # twice, and dict.fromkeys keeps discovery order
+    submodules = [_import(n) for n in dict.fromkeys(submodule_names)]
 
     # Add the root module since that's part of the scan
-    submodules.append(root_module)
+    if root_module not in submodules:
+        submodules.append(root_module)
 
-    # Load and scan the submodules for command components
-    command_components = list()
+    # Collect the command components each module registered at decoration time. Keying the
+    # registry by defining module also keeps star-imported re-exports from surfacing the
+    # same wrapper twice
+    command_components = []
     for submodule in submodules:
-        for component_name in dir(submodule):
-            component = getattr(submodule, component_name)
-            if isinstance(component, CommandWrapper):
-                if verbose:
-                    print("Found command component: {}".format(component))
-
-                command_components.append(component)
+        for component in _COMMAND_REGISTRY.get(submodule.__name__, ()):
+            _log("Found command component: {}", component)
+            command_components.append(component)
 
-    # Build our command trie with collected components and perform rudimentary
-    # dependency resolution for command paths
+    # Build our command trie with collected components. Inserting shallow paths first means
+    # every parent - or its stub - is in place before its children arrive, so a single
+    # depth-ordered pass replaces the repeated dependency-resolution sweeps
     command_trie = CommandTrie(cli_call_name, help=help)
-    while len(command_components) > 0:
-        delete_list = list()
-        for idx in range(0, len(command_components)):
-            command = command_components[idx]
-
-            if command_trie.insert(command) is True:
-                if verbose:
-                    print("Inserted {}".format(command))
-
-                delete_list.append(idx)
-                break
+    command_components.sort(key=lambda c: c.depth)
 
-        if len(delete_list) == 0:
+    for command in command_components:
+        if command_trie.insert(command) is not True:
             raise CommandDependencyError("Dependency resolution error!")
 
-        for idx in reversed(sorted(delete_list)):
-            command_components.pop(idx)
+        _log("Inserted {}", command)
 
     return command_trie
@@ -1,7 +1,9 @@
 class CommandError(Exception):
 
+    # Slots keep instances dict-free; msg is the only state the hierarchy carries
+    __slots__ = ("msg",)
+
     def __init__(self, msg: str = "") -> None:
-        super(CommandError, self).__init__()
         self.msg = msg
 
     def __str__(self) -> str:
@@ -9,14 +11,16 @@ class CommandError(Exception):
 
 
 class CommandArgumentError(CommandError):
-    pass
+    __slots__ = ()
 
 
 class CommandNotFoundError(CommandError):
-    pass
+    __slots__ = ()
 
 
 class CommandDependencyError(CommandError):
 
+    __slots__ = ()
+
     def __str__(self) -> str:
         return "Command Dependency Error: {}".format(self.msg)
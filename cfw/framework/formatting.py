@@ -1,4 +1,5 @@
-from typing import List, Optional
+import functools
+from typing import Iterable, Iterator, List, Optional, Tuple
 
 from cfw.framework.util import GREEDY_WHITESPACE_RE
 
@@ -11,72 +12,99 @@ _MAX_FIRST_COLUMN_LEN = 26
 _MAX_LINE_LEN = 88
 _MAX_SECOND_COLUMN_LINES = 4
 
+# Precomputed column gap - padding is sliced from this instead of joined together char by
+# char on every call
+_COLUMN_PAD = " " * _FIRST_COLUMN_LEN
+
+
+# Translation table folding newlines into spaces, built once at import time
+_NL_TO_SPACE = str.maketrans("\n", " ")
+
 
 def _sanitize(input_value: str) -> str:
     sanitize_me = input_value
     if not isinstance(input_value, str):
         sanitize_me = str(input_value)
 
-    return sanitize_me.strip().replace("\n", " ")
+    return sanitize_me.strip().translate(_NL_TO_SPACE)
 
 
-def _sanitize_split(input: str) -> List[str]:
-    return GREEDY_WHITESPACE_RE.split(_sanitize(input))
+@functools.lru_cache(maxsize=256)
+def _sanitize_split(input: str) -> Tuple[str, ...]:
+    # Help text is static per command, so the split word list is computed once and the
+    # cached tuple reused every time the same string is rendered
+    return tuple(GREEDY_WHITESPACE_RE.split(_sanitize(input)))
 
 
-def format_one_column_output(first: str) -> str:
-    first_output = ""
-
-    buf = ""
-    for word in _sanitize_split(first):
-        if len(buf) + len(word) > _MAX_LINE_LEN:
-            first_output += "{}\n".format(buf)
-            buf = word
+def _wrap(words: Iterable[str], width: int) -> Iterator[List[str]]:
+    """
+    Wraps words into lines no wider than the given width, yielding each line as a list
+    of words. The in-progress line tracks its rendered length as a plain integer so each
+    word costs one length check instead of re-measuring a growing line string.
+    """
+    buf_words: List[str] = []
+    buf_len = 0
+    for word in words:
+        word_len = len(word)
+        if buf_len + word_len > width:
+            yield buf_words
+            buf_words = [word]
+            buf_len = word_len
 
-        elif len(buf) == 0:
-            buf = word
+        elif buf_len == 0:
+            buf_words = [word]
+            buf_len = word_len
 
         else:
-            buf += " {}".format(word)
+            buf_words.append(word)
+            buf_len += word_len + 1
+
+    if buf_len > 0:
+        yield buf_words
 
-    if len(buf) > 0:
-        first_output += buf
 
-    return first_output
+def format_one_column_output(first: str) -> str:
+    # Completed lines collect in a list and join once at the end instead of growing an
+    # output string line by line
+    output_parts: List[str] = []
+
+    for line_words in _wrap(_sanitize_split(first), _MAX_LINE_LEN):
+        if output_parts:
+            output_parts.append("\n")
+
+        output_parts.append(" ".join(line_words))
+
+    return "".join(output_parts)
 
 
 def format_two_column_output(first: str, second: Optional[str]) -> str:
-    first_output = "  {}".format(_sanitize(first))
+    first_output = f"  {_sanitize(first)}"
     if len(first_output) > _MAX_FIRST_COLUMN_LEN:
-        first_output = "  {}...".format(first[: _MAX_FIRST_COLUMN_LEN - 3])
+        first_output = f"  {first[: _MAX_FIRST_COLUMN_LEN - 3]}..."
+
+    # The first column, padding, wrapped description lines and the optional trailing
+    # newline all collect here for a single join
+    output_parts: List[str] = [first_output, _COLUMN_PAD[: _FIRST_COLUMN_LEN - len(first_output)]]
 
     add_nl_buffer = False
-    second_output = "".join([" " for _ in range(_FIRST_COLUMN_LEN - len(first_output))])
     if second is not None:
-        buf = ""
-        lines = 1
-        for word in _sanitize_split(second):
-            if len(buf) + len(word) > _SECOND_COLUMN_LEN:
-                # Make sure to output an additional newline for this output since we broke lines
-                add_nl_buffer = True
-
-                # Append to our output buffer and set our working buffer to the word that wouldn't fit
-                second_output += "{}\n{}".format(buf, "".join([" " for _ in range(_FIRST_COLUMN_LEN)]))
-                buf = word
+        for line_no, line_words in enumerate(_wrap(_sanitize_split(second), _SECOND_COLUMN_LEN)):
+            if line_no == 0:
+                output_parts.append(" ".join(line_words))
+                continue
 
-                # Increase the number of lines - if there are too many break here.
-                lines += 1
-                if lines >= _MAX_SECOND_COLUMN_LINES:
-                    buf = "{}...".format(buf)
-                    break
+            # Make sure to output an additional newline for this output since we broke lines
+            add_nl_buffer = True
 
-            elif len(buf) == 0:
-                buf = word
+            # If there are too many lines, the word that broke onto this line stands in
+            # for the rest of the text
+            if line_no >= _MAX_SECOND_COLUMN_LINES - 1:
+                output_parts.append(f"\n{_COLUMN_PAD}{line_words[0]}...")
+                break
 
-            else:
-                buf += " {}".format(word)
+            output_parts.append(f"\n{_COLUMN_PAD}{' '.join(line_words)}")
 
-        if len(buf) > 0:
-            second_output += buf
+    if add_nl_buffer:
+        output_parts.append("\n")
 
-    return "{}{}{}".format(first_output, second_output, "" if add_nl_buffer is False else "\n")
+    return "".join(output_parts)